@@ -5,8 +5,12 @@
 
 import csv
 import os
+from bisect import bisect_right
 
 PASS_MARK = 40.0
+# Lower bounds for D, C, B, A; anything below the first cutoff is an F
+GRADE_CUTOFFS = [60, 70, 80, 90]
+GRADE_LETTERS = "FDCBA"
 
 def get_manual_input():
     """Collect student marks from user until 'done' is entered."""
@@ -102,89 +106,106 @@ def append_student_record(filename):
     except Exception as e:
         print(f"Could not write to '{filename}': {e}")
 
-def calculate_average(marks_dict):
+def compute_class_stats(student_scores):
+    """Walk the scores once and return a dict with totals, extremes, pass counts and grades."""
+    stats = {
+        "total": 0.0,
+        "count": 0,
+        "max_score": None,
+        "max_students": [],
+        "min_score": None,
+        "min_students": [],
+        "passed": 0,
+        "failed": 0,
+        "grades": {},
+        "distribution": {"A": 0, "B": 0, "C": 0, "D": 0, "F": 0},
+    }
+    for name, score in student_scores.items():
+        stats["total"] += score
+        stats["count"] += 1
+
+        if stats["max_score"] is None or score > stats["max_score"]:
+            stats["max_score"] = score
+            stats["max_students"] = [name]
+        elif score == stats["max_score"]:
+            stats["max_students"].append(name)
+
+        if stats["min_score"] is None or score < stats["min_score"]:
+            stats["min_score"] = score
+            stats["min_students"] = [name]
+        elif score == stats["min_score"]:
+            stats["min_students"].append(name)
+
+        if score >= PASS_MARK:
+            stats["passed"] += 1
+        elif score < PASS_MARK:  # explicit test: NaN counts as neither
+            stats["failed"] += 1
+
+        if score != score:
+            grade = "F"  # NaN (e.g. 'nan' in a CSV) would otherwise bisect to an A
+        else:
+            grade = GRADE_LETTERS[bisect_right(GRADE_CUTOFFS, score)]
+        stats["grades"][name] = grade
+        stats["distribution"][grade] += 1
+    return stats
+
+def calculate_average(marks_dict, stats=None):
     """Return average of values in marks_dict (0.0 if empty)."""
     if not marks_dict:
         return 0.0
-    total = 0.0
-    count = 0
-    for v in marks_dict.values():
-        total += v
-        count += 1
-    return total / count if count else 0.0
-
-def find_max_score(student_scores):
+    if stats is None:
+        stats = compute_class_stats(marks_dict)
+    return stats["total"] / stats["count"] if stats["count"] else 0.0
+
+def find_max_score(student_scores, stats=None):
     """Print highest score and student(s) who achieved it."""
     if not student_scores:
         print("No student data to find max.")
         return
-    max_score = None
-    max_students = []
-    for name, score in student_scores.items():
-        if max_score is None or score > max_score:
-            max_score = score
-            max_students = [name]
-        elif score == max_score:
-            max_students.append(name)
-    names = ", ".join(max_students)
-    print(f"HIGHEST SCORE: {max_score} by {names}")
-
-def find_min_score(student_scores):
+    if stats is None:
+        stats = compute_class_stats(student_scores)
+    names = ", ".join(stats["max_students"])
+    print(f"HIGHEST SCORE: {stats['max_score']} by {names}")
+
+def find_min_score(student_scores, stats=None):
     """Print lowest score and student(s) who achieved it."""
     if not student_scores:
         print("No student data to find min.")
         return
-    min_score = None
-    min_students = []
-    for name, score in student_scores.items():
-        if min_score is None or score < min_score:
-            min_score = score
-            min_students = [name]
-        elif score == min_score:
-            min_students.append(name)
-    names = ", ".join(min_students)
-    print(f"LOWEST SCORE:  {min_score} by {names}")
-
-def assign_grades(student_scores):
+    if stats is None:
+        stats = compute_class_stats(student_scores)
+    names = ", ".join(stats["min_students"])
+    print(f"LOWEST SCORE:  {stats['min_score']} by {names}")
+
+def assign_grades(student_scores, stats=None):
     """Return (grades_dict, distribution_dict)."""
-    grades = {}
-    distribution = {"A": 0, "B": 0, "C": 0, "D": 0, "F": 0}
-    for name, score in student_scores.items():
-        if score >= 90:
-            grade = "A"
-        elif score >= 80:
-            grade = "B"
-        elif score >= 70:
-            grade = "C"
-        elif score >= 60:
-            grade = "D"
-        else:
-            grade = "F"
-        grades[name] = grade
-        distribution[grade] = distribution.get(grade, 0) + 1
-    return grades, distribution
+    if stats is None:
+        stats = compute_class_stats(student_scores)
+    return stats["grades"], stats["distribution"]
 
-def print_summary(student_scores, grades):
+def print_summary(student_scores, stats=None):
     """Print class statistics and a formatted table of each student with grade."""
     if not student_scores:
         print("No student data to show.")
         return
 
-    passed = [n for n, s in student_scores.items() if s >= PASS_MARK]
-    failed = [n for n, s in student_scores.items() if s < PASS_MARK]
+    # Single pass over the scores; the helpers below just read from it
+    if stats is None:
+        stats = compute_class_stats(student_scores)
+    grades = stats["grades"]
 
     print("\n--- Class Statistics ---")
-    avg = calculate_average(student_scores)
+    avg = calculate_average(student_scores, stats)
     print(f"Average Score: {avg:.2f}")
 
-    find_max_score(student_scores)
-    find_min_score(student_scores)
+    find_max_score(student_scores, stats)
+    find_min_score(student_scores, stats)
 
-    _, final_dist = assign_grades(student_scores)
+    _, final_dist = assign_grades(student_scores, stats)
     print(f"Grade Counts:  {final_dist}")
 
-    print(f"Passed: {len(passed)} students")
-    print(f"Failed: {len(failed)} students")
+    print(f"Passed: {stats['passed']} students")
+    print(f"Failed: {stats['failed']} students")
 
     # Print table header
     print("\n" + "="*50)
@@ -237,8 +258,7 @@ def main():
             continue
 
         if student_scores:
-            final_grades, _ = assign_grades(student_scores)
-            print_summary(student_scores, final_grades)
+            print_summary(student_scores, compute_class_stats(student_scores))
         else:
             if choice in ['1', '2', '3']:
                 print("No data loaded.")
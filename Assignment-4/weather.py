@@ -5,13 +5,17 @@
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import matplotlib
+matplotlib.use('Agg')  # non-interactive: figures are only saved to files
 import matplotlib.pyplot as plt
 
 # ================================
 # TASK 1: LOAD DATA
 # ================================
 
-df = pd.read_csv("weather.csv")  # <-- Replace with your actual file name
+df = pd.read_csv("weather.csv", engine='pyarrow', parse_dates=['Date'], date_format='%Y-%m-%d')  # <-- Replace with your actual file name
 
 print("\n=== HEAD OF DATA ===")
 print(df.head())
@@ -26,32 +30,44 @@ print(df.describe())
 # TASK 2: CLEANING DATA
 # ================================
 
-# Convert Date → datetime
-df['Date'] = pd.to_datetime(df['Date'])
+# Convert Date → datetime; blank or malformed dates become NaT (the pyarrow
+# reader leaves the column as object dtype when a Date cell is empty)
+df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce', cache=True)
 
 # Drop duplicates
 df = df.drop_duplicates()
 
-# Fill missing values
-df['Temperature'] = df['Temperature'].fillna(df['Temperature'].mean())
-df['Rainfall'] = df['Rainfall'].fillna(0)
-df['Humidity'] = df['Humidity'].fillna(df['Humidity'].median())
+# Fill missing values (directly on the underlying NumPy arrays)
+temp = df['Temperature'].to_numpy(dtype=float)
+temp_missing = np.isnan(temp)
+df['Temperature'] = np.where(temp_missing, temp[~temp_missing].mean(), temp)
+
+df['Rainfall'] = np.nan_to_num(df['Rainfall'].to_numpy(dtype=float), nan=0.0)
+
+humidity = df['Humidity'].to_numpy(dtype=float)
+df['Humidity'] = np.where(np.isnan(humidity), np.nanmedian(humidity), humidity)
 
 # Filter important columns
 df = df[['Date', 'Temperature', 'Rainfall', 'Humidity']]
 
-# Add Month & Year
-df['Month'] = df['Date'].dt.month
-df['Year'] = df['Date'].dt.year
+# Add Month & Year (derived from the raw datetime64 values); rows without a
+# date get <NA> so they stay out of every per-month/season group
+dates = df['Date'].to_numpy(dtype='datetime64[D]')
+no_date = np.isnat(dates)
+months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+years = dates.astype('datetime64[Y]').astype(int) + 1970
+df['Month'] = pd.arrays.IntegerArray(months.astype('int8'), no_date)
+df['Year'] = pd.arrays.IntegerArray(years.astype('int64'), no_date)
 
 # ================================
 # TASK 3: STATISTICAL ANALYSIS (NumPy)
 # ================================
 
-daily_mean = np.mean(df['Temperature'])
-daily_min = np.min(df['Temperature'])
-daily_max = np.max(df['Temperature'])
-daily_std = np.std(df['Temperature'])
+temps = df['Temperature'].to_numpy()
+daily_mean = temps.mean()
+daily_min = temps.min()
+daily_max = temps.max()
+daily_std = temps.std()
 
 print("\n=== DAILY TEMPERATURE STATISTICS ===")
 print("Mean Temperature:", daily_mean)
@@ -68,66 +84,85 @@ print(monthly_stats)
 # TASK 4: VISUALIZATION (Matplotlib)
 # ================================
 
+MAX_PLOT_POINTS = 2000
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the line's shape."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+# Downsample long series before drawing; short ones are plotted as-is
+temp_x = df['Date'].to_numpy()
+temp_y = df['Temperature'].to_numpy()
+if len(temp_y) > MAX_PLOT_POINTS:
+    keep = lttb_indices(temp_x.astype('int64').astype(float), temp_y, MAX_PLOT_POINTS)
+    temp_x, temp_y = temp_x[keep], temp_y[keep]
+
+# All charts share one figure so the backend and fonts are set up only once
+fig, axes = plt.subplots(2, 2, figsize=(14,10))
+
 # ---- 1. Line Plot (Daily Temperature)
-plt.figure(figsize=(10,5))
-plt.plot(df['Date'], df['Temperature'])
-plt.title("Daily Temperature Trend")
-plt.xlabel("Date")
-plt.ylabel("Temperature (°C)")
-plt.savefig("daily_temperature.png")
-plt.show()
+ax = axes[0, 0]
+ax.plot(temp_x, temp_y)
+ax.set_title("Daily Temperature Trend")
+ax.set_xlabel("Date")
+ax.set_ylabel("Temperature (°C)")
 
 # ---- 2. Bar Chart (Monthly Rainfall)
-monthly_rainfall = df.groupby('Month')['Rainfall'].sum()
-
-plt.figure(figsize=(10,5))
-plt.bar(monthly_rainfall.index, monthly_rainfall.values)
-plt.title("Monthly Rainfall")
-plt.xlabel("Month")
-plt.ylabel("Rainfall (mm)")
-plt.savefig("monthly_rainfall.png")
-plt.show()
+# Month is a small integer (1-12), so a weighted bincount replaces the groupby;
+# undated rows go to the unused bucket 0 and are left out
+month_codes = df['Month'].to_numpy(dtype='int64', na_value=0)
+rainfall_by_month = np.bincount(month_codes, weights=df['Rainfall'].to_numpy(), minlength=13)
+observed_months = np.flatnonzero(np.bincount(month_codes, minlength=13)[1:]) + 1
+monthly_rainfall = pd.Series(rainfall_by_month[observed_months],
+                             index=pd.Index(observed_months, name='Month'), name='Rainfall')
+
+ax = axes[0, 1]
+ax.bar(monthly_rainfall.index, monthly_rainfall.values)
+ax.set_title("Monthly Rainfall")
+ax.set_xlabel("Month")
+ax.set_ylabel("Rainfall (mm)")
 
 # ---- 3. Scatter Plot (Humidity vs Temperature)
-plt.figure(figsize=(7,5))
-plt.scatter(df['Temperature'], df['Humidity'])
-plt.title("Humidity vs Temperature")
-plt.xlabel("Temperature (°C)")
-plt.ylabel("Humidity (%)")
-plt.savefig("humidity_vs_temperature.png")
-plt.show()
+ax = axes[1, 0]
+ax.scatter(df['Temperature'], df['Humidity'])
+ax.set_title("Humidity vs Temperature")
+ax.set_xlabel("Temperature (°C)")
+ax.set_ylabel("Humidity (%)")
 
-# ---- 4. Combined Subplots (Bonus)
-fig, axs = plt.subplots(1, 2, figsize=(12,5))
+# Fourth slot is left empty
+axes[1, 1].axis('off')
 
-# Subplot 1
-axs[0].plot(df['Date'], df['Temperature'])
-axs[0].set_title("Temperature Trend")
-
-# Subplot 2
-axs[1].bar(monthly_rainfall.index, monthly_rainfall.values)
-axs[1].set_title("Monthly Rainfall")
-
-plt.savefig("combined_plots.png")
-plt.show()
+fig.tight_layout()
+fig.savefig("dashboard.png")
+plt.close(fig)
 
 # ================================
 # TASK 5: GROUPING & AGGREGATION
 # ================================
 
-def get_season(month):
-    if month in [12,1,2]:
-        return "Winter"
-    elif month in [3,4,5]:
-        return "Summer"
-    elif month in [6,7,8]:
-        return "Rainy"
-    else:
-        return "Autumn"
-
-df["Season"] = df["Month"].apply(get_season)
+# Bin months into seasons (Dec-Feb, Mar-May, Jun-Aug, Sep-Nov); December wraps
+# back to Winter, so labels repeat and the resulting Categorical is unordered
+df["Season"] = pd.cut(df["Month"], bins=[0, 2, 5, 8, 11, 12],
+                      labels=['Winter', 'Summer', 'Rainy', 'Autumn', 'Winter'],
+                      ordered=False)
 
-season_stats = df.groupby("Season")['Temperature'].mean()
+season_stats = df.groupby("Season", observed=True)['Temperature'].mean()
 print("\n=== SEASONAL TEMPERATURE MEAN ===")
 print(season_stats)
 
@@ -135,7 +170,12 @@ print(season_stats)
 # TASK 6: EXPORT CLEANED DATA + REPORT
 # ================================
 
-df.to_csv("cleaned_weather.csv", index=False)
+# Write through Arrow's CSV writer; Date is stored as a plain calendar date
+cleaned = pa.Table.from_pandas(df, preserve_index=False)
+cleaned = cleaned.set_column(cleaned.schema.get_field_index('Date'), 'Date',
+                             cleaned['Date'].cast(pa.date32()))
+pa_csv.write_csv(cleaned, "cleaned_weather.csv",
+                 write_options=pa_csv.WriteOptions(quoting_style='none', quoting_header='none'))
 print("\nCleaned CSV exported → cleaned_weather.csv")
 
 # ---- Generate Report
@@ -148,9 +188,9 @@ with open("report.md", "w") as f:
     f.write(f"- Standard Deviation: {daily_std:.2f}\n\n")
     
     f.write("## Monthly Rainfall\n")
-    f.write(str(monthly_rainfall))
-    f.write("\n\n## Seasonal Temperature Averages\n")
-    f.write(str(season_stats))
+    f.write("".join(f"- Month {month}: {rain:.1f} mm\n" for month, rain in monthly_rainfall.items()))
+    f.write("\n## Seasonal Temperature Averages\n")
+    f.write("".join(f"- {season}: {temp:.2f} °C\n" for season, temp in season_stats.items()))
 
 print("Report generated → report.md")
 
@@ -3,6 +3,11 @@ from pathlib import Path
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import matplotlib
+matplotlib.use('Agg')  # headless backend; the dashboard is only saved to disk
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -16,6 +21,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+REQUIRED_COLUMNS = ['Timestamp', 'Building', 'kWh']
+
 
 # -----------------------------
 # Data Ingestion & Cleaning
@@ -27,12 +34,10 @@ def ingest_data(data_dir: Path) -> pd.DataFrame:
     and returns a combined pandas DataFrame indexed by Timestamp.
 
     - Uses pathlib to find .csv files
-    - Uses pandas.read_csv with on_bad_lines='skip'
-    - Converts 'Timestamp' to datetime and sets as index
-    - Logs and skips files that error
+    - Reads them as one pyarrow dataset, skipping bad lines
+    - Converts 'Timestamp' (per file) to datetime and sets as index
+    - Logs and skips files that error or lack a required column
     """
-    all_rows = []
-
     if not data_dir.exists():
         logger.error("Data directory does not exist: %s", data_dir)
         return pd.DataFrame()
@@ -40,55 +45,130 @@ def ingest_data(data_dir: Path) -> pd.DataFrame:
     csv_files = sorted(data_dir.glob("*.csv"))
     if not csv_files:
         logger.warning("No CSV files found in data directory: %s", data_dir)
+        logger.warning("No valid data ingested.")
+        return pd.DataFrame()
 
-    for csv_file in csv_files:
+    # Read the required columns as text so one malformed value cannot fail the
+    # scan; the coerce + dropna steps below do the type cleaning
+    schema = pa.schema([(c, pa.string()) for c in REQUIRED_COLUMNS])
+    csv_format = ds.CsvFileFormat(
+        parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+        # Blank cells become nulls (not ''), so e.g. an empty Building stays missing
+        convert_options=pa_csv.ConvertOptions(
+            column_types=dict(zip(schema.names, schema.types)),
+            strings_can_be_null=True,
+        ),
+    )
+
+    # Expect columns: Timestamp, Building, kWh; check each file's own header
+    valid_files = []
+    candidates = ds.dataset([str(f) for f in csv_files], schema=schema, format=csv_format)
+    for fragment in candidates.get_fragments():
+        file_name = Path(fragment.path).name
         try:
-            df = pd.read_csv(csv_file, on_bad_lines='skip')
-            # Expect columns: Timestamp, Building, kWh
-            if 'Timestamp' not in df.columns:
-                logger.warning("Missing 'Timestamp' column in %s; skipping.", csv_file)
-                continue
-            if 'Building' not in df.columns:
-                logger.warning("Missing 'Building' column in %s; skipping.", csv_file)
-                continue
-            if 'kWh' not in df.columns:
-                logger.warning("Missing 'kWh' column in %s; skipping.", csv_file)
-                continue
-
-            # Convert Timestamp
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-            df = df.dropna(subset=['Timestamp'])
-            df = df.sort_values('Timestamp')
-            all_rows.append(df)
-            logger.info("Ingested %s with %d rows.", csv_file.name, len(df))
-        except FileNotFoundError:
-            logger.exception("File not found: %s", csv_file)
-            continue
+            columns = fragment.physical_schema.names
         except Exception:
-            logger.exception("Error reading file: %s", csv_file)
+            logger.exception("Error reading file: %s", file_name)
+            continue
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            logger.warning("Missing %s column(s) in %s; skipping.", missing, file_name)
             continue
+        valid_files.append(fragment.path)
 
-    if not all_rows:
+    if not valid_files:
         logger.warning("No valid data ingested.")
         return pd.DataFrame()
 
-    df_combined = pd.concat(all_rows, ignore_index=True)
+    try:
+        dataset = ds.dataset(valid_files, schema=schema, format=csv_format)
+        # One Arrow table per file, concatenated without copying, so the rows of
+        # each file can still be told apart for Timestamp parsing below
+        tables = [fragment.to_table(schema=schema) for fragment in dataset.get_fragments()]
+    except Exception:
+        logger.exception("Error reading CSV files in: %s", data_dir)
+        return pd.DataFrame()
+
+    file_rows = [t.num_rows for t in tables]
+    if logger.isEnabledFor(logging.DEBUG):
+        for path, n_rows in zip(valid_files, file_rows):
+            logger.debug("Read %s with %d raw rows.", Path(path).name, n_rows)
+    df_combined = pa.concat_tables(tables).to_pandas(types_mapper=pd.ArrowDtype)
+
+    # Convert Timestamp file by file: to_datetime infers one format from the
+    # first value, and different files may use different (valid) layouts
+    bounds = np.cumsum([0] + file_rows)
+    df_combined['Timestamp'] = pd.concat([
+        pd.to_datetime(df_combined['Timestamp'].iloc[start:stop], errors='coerce')
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ])
+    n_rows = len(df_combined)
+    df_combined = df_combined.dropna(subset=['Timestamp'])
+    if len(df_combined) < n_rows:
+        logger.warning("Dropped %d rows with a missing or invalid Timestamp.", n_rows - len(df_combined))
+    df_combined = df_combined.sort_values('Timestamp', kind='stable')
     df_combined = df_combined.set_index('Timestamp')
 
-    # Ensure kWh numeric
-    df_combined['kWh'] = pd.to_numeric(df_combined['kWh'], errors='coerce')
+    # Ensure kWh numeric; plain float64 so coerced NaN and nulls both drop below
+    df_combined['kWh'] = pd.to_numeric(df_combined['kWh'], errors='coerce').astype('float64')
+    n_rows = len(df_combined)
     df_combined = df_combined.dropna(subset=['kWh'])
+    if len(df_combined) < n_rows:
+        logger.warning("Dropped %d rows with a missing or non-numeric kWh.", n_rows - len(df_combined))
+    logger.info("Ingested %d files, %d total rows.", len(valid_files), len(df_combined))
+
+    # Few distinct buildings: store as category so groupbys use integer codes
+    df_combined['Building'] = df_combined['Building'].astype('category')
 
     return df_combined
 
 
+# -----------------------------
+# Plot Helpers
+# -----------------------------
+
+MAX_PLOT_POINTS = 2000
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of n_out points (always including the first and last)
+    that preserve the visual shape of the (x, y) line.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        # Pick the point forming the largest triangle with the previous pick
+        # and the average of the next bucket
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
 # -----------------------------
 # Object-Oriented Modeling & Aggregation
 # -----------------------------
 
 class BuildingManager:
     def __init__(self, df_combined: pd.DataFrame):
-        self.df = df_combined.copy()
+        # The manager only reads from the frame, so no defensive copy is needed
+        self.df = df_combined
         self.summary_stats: Optional[pd.DataFrame] = None
         self.daily_totals: Optional[pd.DataFrame] = None
         self.weekly_avg_by_building: Optional[pd.DataFrame] = None
@@ -103,7 +183,8 @@ class BuildingManager:
             self.summary_stats = pd.DataFrame()
             return self.summary_stats
 
-        grouped = self.df.groupby('Building')['kWh']
+        # Result is re-sorted by total below, so skip sorting the group keys
+        grouped = self.df.groupby('Building', observed=True, sort=False)['kWh']
         self.summary_stats = grouped.agg(
             mean_kWh='mean',
             min_kWh='min',
@@ -116,7 +197,7 @@ class BuildingManager:
     def calculate_time_trends(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
         - Daily campus totals using resample('D') on the full dataset
-        - Average weekly usage per building via groupby + resample
+        - Average weekly usage per building via one pivot + resample
         """
         if self.df.empty:
             logger.warning("DataFrame is empty; cannot compute time trends.")
@@ -127,19 +208,22 @@ class BuildingManager:
         # Daily campus totals
         self.daily_totals = self.df['kWh'].resample('D').sum()
 
-        # Weekly average usage per building
-        weekly = self.df.groupby('Building')['kWh'].resample('W').mean()
-        # Convert to wide format for plotting bars per building
-        self.weekly_avg_by_building = weekly.unstack(level=0)
+        # Weekly average usage per building: pivot to wide format (one column per
+        # building) keeping sums and counts, so a single resample gives exact means
+        wide = self.df.pivot_table(
+            index=self.df.index, columns='Building', values='kWh',
+            aggfunc=['sum', 'count'], observed=True
+        )
+        weekly = wide.resample('W').sum()
+        self.weekly_avg_by_building = weekly['sum'] / weekly['count']
         logger.info("Computed daily totals (%d days) and weekly averages.", len(self.daily_totals))
 
         # Peak hours per building (proxy): hour-of-day vs max usage
-        df_with_hour = self.df.copy()
-        df_with_hour['Hour'] = df_with_hour.index.hour
-        self.peak_hours_by_building = df_with_hour.groupby('Building').apply(
-            lambda g: g.loc[g['kWh'].idxmax()][['Hour', 'kWh']]
-        )
-        self.peak_hours_by_building.columns = ['PeakHour', 'Peak_kWh']
+        peaks = self.df.groupby('Building', observed=True)['kWh'].agg(['idxmax', 'max'])
+        self.peak_hours_by_building = pd.DataFrame({
+            'PeakHour': pd.DatetimeIndex(peaks['idxmax']).hour,
+            'Peak_kWh': peaks['max'],
+        }, index=peaks.index)
         return self.daily_totals, self.weekly_avg_by_building
 
     def generate_dashboard_plots(self, output_path: Path) -> Path:
@@ -160,7 +244,12 @@ class BuildingManager:
 
         # Panel 1: Daily Trend Line (Campus total)
         if isinstance(self.daily_totals, pd.Series) and not self.daily_totals.empty:
-            ax1.plot(self.daily_totals.index, self.daily_totals.values, label='Daily Total kWh', color='tab:blue')
+            days = self.daily_totals.index.to_numpy()
+            totals = self.daily_totals.to_numpy(dtype=float)
+            if len(totals) > MAX_PLOT_POINTS:
+                keep = _lttb_indices(days.astype('int64').astype(float), totals, MAX_PLOT_POINTS)
+                days, totals = days[keep], totals[keep]
+            ax1.plot(days, totals, label='Daily Total kWh', color='tab:blue')
             ax1.set_title('Daily Campus Energy Consumption')
             ax1.set_xlabel('Date')
             ax1.set_ylabel('kWh')
@@ -267,24 +356,23 @@ def _simulate_data(output_dir: Path) -> Path:
 
     # Simulate three buildings with 30 days of hourly data
     rng = pd.date_range(end=pd.Timestamp.today().normalize(), periods=30*24, freq='H')
-    buildings = ['Library', 'Engineering', 'Hostel']
-
-    for b in buildings:
-        df = pd.DataFrame({
-            'Timestamp': rng,
-            'Building': b,
-            'kWh': (
-                50
-                + 10 * pd.Series(range(len(rng))) % 24  # small daily pattern
-                + (10 if b == 'Engineering' else 0)     # baseline difference
-                + (5 if b == 'Hostel' else 0)
-            )
+    buildings = {'Library': 0, 'Engineering': 10, 'Hostel': 5}  # baseline difference
+
+    # Shared daily pattern and mild random variation, computed once for all buildings
+    t = np.arange(len(rng))
+    base = 50 + (10 * t) % 24
+    noise = np.random.default_rng(42).normal(0, 3, size=len(rng))
+    timestamps = pa.array(rng.to_numpy(), type=pa.timestamp('s'))
+    write_options = pa_csv.WriteOptions(quoting_style='none', quoting_header='none')
+
+    for b, offset in buildings.items():
+        table = pa.Table.from_pydict({
+            'Timestamp': timestamps,
+            'Building': [b] * len(rng),
+            'kWh': base + offset + noise,
         })
-        # Add mild random variation
-        df['kWh'] = df['kWh'] + pd.Series(np.random.default_rng(42).normal(0, 3, size=len(df)))
-
         file_path = data_dir / f"{b.lower()}_energy.csv"
-        df.to_csv(file_path, index=False)
+        pa_csv.write_csv(table, file_path, write_options=write_options)
     logger.info("Simulated data written to %s", data_dir)
     return data_dir
 
@@ -32,8 +32,11 @@ for i in range(total_meals):
 print("\n\033[1;96m{:<6}{:<25}{:<15}\033[0m".format("S.NO", "MEAL NAME", "CALORIES"))
 print("\033[1;96m" + "-" * 50 + "\033[0m")
 
-for i in range(len(meal_names)):
-    print("\033[1;96m{:<6}{:<25}{:<15}\033[0m".format(i+1, meal_names[i], meal_calories[i]))
+# Build all rows first, then print them with a single write
+rows = ["\033[1;96m{:<6}{:<25}{:<15}\033[0m".format(i+1, name, cal)
+        for i, (name, cal) in enumerate(zip(meal_names, meal_calories))]
+if rows:
+    print("\n".join(rows))
 
 print("\033[1;96m" + "-" * 50 + "\033[0m")
 
@@ -57,8 +60,8 @@ if save == "yes":
         f.write(f"NAME: Avijit\nROLL NUMBER: 2501730308\nDATE: {dt.datetime.now()}\n\n")
         f.write("{:<6}{:<25}{:<15}\n".format("S.NO", "MEAL NAME", "CALORIES"))
         f.write("-" * 50 + "\n")
-        for i in range(len(meal_names)):
-            f.write("{:<6}{:<25}{:<15}\n".format(i+1, meal_names[i], meal_calories[i]))
+        f.write("".join("{:<6}{:<25}{:<15}\n".format(i+1, name, cal)
+                        for i, (name, cal) in enumerate(zip(meal_names, meal_calories))))
         f.write("-" * 50 + "\n")
         f.write(f"Total Calories Consumed : {total_cal:.2f}\n")
         f.write(f"Average Calories per Meal : {avg_cal:.2f}\n")